@@ -16,6 +16,7 @@ from dotz import core
 
 from . import templates
 from .core import (
+    _json_loads,
     add_dotfile,
     add_file_pattern,
     clone_repo,
@@ -805,13 +806,16 @@ def diagnose() -> None:
 
     # Check tracked directories
     tracked_dirs_file = DOTZ_DIR / "tracked_dirs.json"
-    if not tracked_dirs_file.exists() or not json.loads(
-        tracked_dirs_file.read_text() or "[]"
-    ):
+    # tracked_dirs.json is UTF-8 whatever the locale, so decode it as bytes
+    dirs = (
+        _json_loads(tracked_dirs_file.read_bytes() or b"[]")
+        if tracked_dirs_file.exists()
+        else []
+    )
+    if not dirs:
         typer.secho("WARNING: No tracked directories found", fg=typer.colors.YELLOW)
         typer.secho("Add directories: dotz add <directory>", fg=typer.colors.CYAN)
     else:
-        dirs = json.loads(tracked_dirs_file.read_text())
         typer.secho(f"Tracked directories: {', '.join(dirs)}", fg=typer.colors.GREEN)
 
     typer.secho("Diagnosis complete", fg=typer.colors.WHITE, bold=True)
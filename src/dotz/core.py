@@ -1,14 +1,20 @@
 """Core functionality for dotz - a Git-backed dotfiles manager."""
 
+import copy
 import fnmatch
+import functools
 import json
 import os
+import re
+import secrets
 import shutil
 import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import typer
 from git import GitCommandError, InvalidGitRepositoryError, Repo
@@ -22,6 +28,11 @@ from rich.progress import (
 )
 from rich.status import Status
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speed-up
+    orjson = None
+
 from .exceptions import (
     DotzBackupError,
     DotzFileNotFoundError,
@@ -57,11 +68,9 @@ def get_home_dir() -> Path:
     return Path.home()
 
 
-def get_dotz_paths(home_dir: Optional[Path] = None) -> Dict[str, Path]:
-    """Get all dotz-related paths based on home directory."""
-    if home_dir is None:
-        home_dir = get_home_dir()
-
+@functools.lru_cache(maxsize=8)
+def _build_dotz_paths(home_dir: Path) -> Dict[str, Path]:
+    """Build the dotz path layout for a home directory."""
     dotz_dir = home_dir / DOTZ_DIR_NAME
     work_tree = dotz_dir / REPO_DIR_NAME
     tracked_dirs_file = dotz_dir / TRACKED_DIRS_FILENAME
@@ -78,6 +87,15 @@ def get_dotz_paths(home_dir: Optional[Path] = None) -> Dict[str, Path]:
     }
 
 
+def get_dotz_paths(home_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """Get all dotz-related paths based on home directory."""
+    if home_dir is None:
+        home_dir = get_home_dir()
+
+    # The layout is cached per home; hand out a copy so callers can't alter it
+    return dict(_build_dotz_paths(home_dir))
+
+
 def update_paths(home_dir: Optional[Path] = None) -> None:
     """Update global paths. Useful for testing or when HOME changes."""
     global HOME, DOTZ_DIR, WORK_TREE, TRACKED_DIRS_FILE, CONFIG_FILE, BACKUP_DIR
@@ -140,6 +158,23 @@ BACKUP_DIR = _paths["backup_dir"]
 # ============================================================================
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    Serialize JSON as UTF-8 with two-space indentation, using orjson when
+    installed. Returns bytes so callers write it without the locale encoding.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def ensure_repo() -> Repo:
     """Ensure that a dotz repository exists and return it."""
     try:
@@ -227,26 +262,22 @@ def save_tracked_dir(dir_path: Path) -> None:
     if not TRACKED_DIRS_FILE.exists():
         tracked = []
     else:
-        with open(TRACKED_DIRS_FILE, "r") as f:
-            tracked = json.load(f)
+        tracked = _json_loads(TRACKED_DIRS_FILE.read_bytes())
     dir_str = str(dir_path)
     if dir_str not in tracked:
         tracked.append(dir_str)
-        with open(TRACKED_DIRS_FILE, "w") as f:
-            json.dump(tracked, f)
+        TRACKED_DIRS_FILE.write_bytes(_json_dumps(tracked))
 
 
 def remove_tracked_dir(dir_path: Path) -> None:
     """Remove a directory from the tracked_dirs.json file."""
     if not TRACKED_DIRS_FILE.exists():
         return
-    with open(TRACKED_DIRS_FILE, "r") as f:
-        tracked = json.load(f)
+    tracked = _json_loads(TRACKED_DIRS_FILE.read_bytes())
     dir_str = str(dir_path)
     if dir_str in tracked:
         tracked.remove(dir_str)
-        with open(TRACKED_DIRS_FILE, "w") as f:
-            json.dump(tracked, f)
+        TRACKED_DIRS_FILE.write_bytes(_json_dumps(tracked))
 
 
 # ============================================================================
@@ -725,59 +756,155 @@ def list_tracked_files() -> List[str]:
 # ============================================================================
 
 
+def merge_defaults(
+    config: Dict[str, Any], defaults: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Recursively merge a user configuration over the defaults so that every
+    default key is present. Returns a new dict; neither argument is modified.
+    """
+    if defaults is None:
+        defaults = DEFAULT_CONFIG
+
+    merged = copy.deepcopy(defaults)
+    for key, value in config.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_defaults(value, merged[key])
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Parse a config file. The file's mtime and size are part of the cache key,
+    so an edit made outside dotz is picked up on the next load.
+    """
+    config: Dict[str, Any] = _json_loads(Path(path).read_bytes())
+    return config
+
+
 def load_config() -> Dict[str, Any]:
     """Load configuration from config file, creating default if not exists."""
     if not CONFIG_FILE.exists():
         # Create default config file if it doesn't exist
-        default_config = DEFAULT_CONFIG.copy()
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
         save_config(default_config)
         return default_config
 
     try:
-        with open(CONFIG_FILE, "r") as f:
-            config = json.load(f)
-
-        # Merge with defaults to ensure all keys exist
-        merged_config = DEFAULT_CONFIG.copy()
-        merged_config.update(config)
-
-        # Ensure nested dictionaries are also merged
-        if "file_patterns" in config and isinstance(config["file_patterns"], dict):
-            file_patterns = merged_config["file_patterns"]
-            if isinstance(file_patterns, dict):
-                file_patterns.update(config["file_patterns"])
-        if "search_settings" in config and isinstance(config["search_settings"], dict):
-            search_settings = merged_config["search_settings"]
-            if isinstance(search_settings, dict):
-                search_settings.update(config["search_settings"])
-
-        return merged_config
-    except (json.JSONDecodeError, KeyError) as e:
+        stat = CONFIG_FILE.stat()
+        config = _read_config_file(str(CONFIG_FILE), stat.st_mtime_ns, stat.st_size)
+        if not isinstance(config, dict):
+            raise ValueError("config must be a JSON object")
+
+        # Merge with defaults to ensure all keys exist. The merge copies
+        # everything, so callers never mutate the cached dict.
+        return merge_defaults(config)
+    except (ValueError, KeyError) as e:
+        # ValueError covers invalid JSON and JSON that is not an object
         typer.secho(
             f"Warning: Error reading config file: {e}. Using defaults.",
             fg=typer.colors.YELLOW,
             err=True,
         )
         # Save the default config to fix the corrupted file
-        default_config = DEFAULT_CONFIG.copy()
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
         save_config(default_config)
         return default_config
 
 
+def _copy_file_owner_and_mode(source: Path, dest: Path) -> None:
+    """
+    Give dest the permissions and, where allowed, the owner of source. If
+    source does not exist, use the mode a newly created file would get.
+    """
+    try:
+        source_stat = source.stat()
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(dest, 0o666 & ~umask)
+        return
+
+    os.chmod(dest, source_stat.st_mode & 0o7777)
+    if hasattr(os, "chown"):
+        try:
+            os.chown(dest, source_stat.st_uid, source_stat.st_gid)
+        except PermissionError:
+            pass
+
+
 def save_config(config: Dict[str, Any]) -> None:
     """Save configuration to config file."""
     DOTZ_DIR.mkdir(exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
+    data = _json_dumps(config)
+
+    # Skip the write when the file already holds exactly this config
+    try:
+        if CONFIG_FILE.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+
+    # Write a uniquely named sibling of the real file and rename it over that
+    # file so readers never see a partial write. Resolving first keeps a
+    # symlinked config.json a symlink rather than replacing it.
+    target = CONFIG_FILE.resolve()
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=target.name + ".")
+    tmp_file = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        _copy_file_owner_and_mode(target, tmp_file)
+        os.replace(tmp_file, target)
+    except Exception:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    # A rewrite within the same mtime tick could keep the old cache key
+    _read_config_file.cache_clear()
 
 
 def validate_file_patterns(patterns: List[str]) -> None:
     """Validate that file patterns is a list of strings."""
     if not isinstance(patterns, list):
         raise ValueError("Patterns must be a list")
-    for pattern in patterns:
-        if not isinstance(pattern, str):
-            raise ValueError("All patterns must be strings")
+    if not all(isinstance(pattern, str) for pattern in patterns):
+        raise ValueError("All patterns must be strings")
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_patterns(
+    patterns: Tuple[str, ...], case_sensitive: bool
+) -> Optional[re.Pattern[str]]:
+    """Combine shell-style patterns into a single compiled regular expression."""
+    if not patterns:
+        return None
+    if not case_sensitive:
+        patterns = tuple(pattern.lower() for pattern in patterns)
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def _pattern_matcher(
+    include_patterns: List[str], exclude_patterns: List[str], case_sensitive: bool
+) -> Callable[[str], bool]:
+    """Build a predicate that checks file names against include/exclude patterns."""
+    include_regex = _compile_patterns(tuple(include_patterns), case_sensitive)
+    exclude_regex = _compile_patterns(tuple(exclude_patterns), case_sensitive)
+
+    def matches(filename: str) -> bool:
+        if not case_sensitive:
+            filename = filename.lower()
+
+        # Check if file matches any include pattern
+        if include_regex is None or include_regex.match(filename) is None:
+            return False
+
+        # Check if file matches any exclude pattern
+        return exclude_regex is None or exclude_regex.match(filename) is None
+
+    return matches
 
 
 def matches_patterns(
@@ -790,18 +917,29 @@ def matches_patterns(
     Check if a filename matches the include patterns and doesn't match exclude
     patterns.
     """
-    if not case_sensitive:
-        filename = filename.lower()
-        include_patterns = [p.lower() for p in include_patterns]
-        exclude_patterns = [p.lower() for p in exclude_patterns]
-
-    # Check if file matches any include pattern
-    included = any(fnmatch.fnmatch(filename, pattern) for pattern in include_patterns)
+    matches = _pattern_matcher(include_patterns, exclude_patterns, case_sensitive)
+    return matches(filename)
 
-    # Check if file matches any exclude pattern
-    excluded = any(fnmatch.fnmatch(filename, pattern) for pattern in exclude_patterns)
 
-    return included and not excluded
+def _scan_files(
+    directory: Union[str, Path], recursive: bool, follow_symlinks: bool
+) -> Iterator[os.DirEntry]:
+    """
+    Yield directory entries for regular files under a directory. Entries from
+    os.scandir carry their file type, so no extra stat() is needed per entry.
+    Symlinked directories are never descended into.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_symlink() and not follow_symlinks:
+                continue
+            if entry.is_file():
+                yield entry
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                try:
+                    yield from _scan_files(entry.path, recursive, follow_symlinks)
+                except PermissionError:
+                    continue
 
 
 def find_config_files(
@@ -811,30 +949,19 @@ def find_config_files(
     if config is None:
         config = load_config()
 
-    include_patterns = config["file_patterns"]["include"]
-    exclude_patterns = config["file_patterns"]["exclude"]
-    case_sensitive = config["search_settings"]["case_sensitive"]
+    matches = _pattern_matcher(
+        config["file_patterns"]["include"],
+        config["file_patterns"]["exclude"],
+        config["search_settings"]["case_sensitive"],
+    )
     follow_symlinks = config["search_settings"]["follow_symlinks"]
 
-    found_files = []
-    directory = Path(directory)
-
-    if recursive:
-        iterator = directory.rglob("*")
-    else:
-        iterator = directory.iterdir()
-
-    for item in iterator:
-        if not follow_symlinks and item.is_symlink():
-            continue
-
-        if item.is_file():
-            if matches_patterns(
-                item.name, include_patterns, exclude_patterns, case_sensitive
-            ):
-                found_files.append(item)
-
-    return found_files
+    # Match on the entry name and only build Path objects for the hits
+    return [
+        Path(entry.path)
+        for entry in _scan_files(directory, recursive, follow_symlinks)
+        if matches(entry.name)
+    ]
 
 
 def get_config_value(key_path: str, default: Any = None, quiet: bool = False) -> Any:
@@ -983,6 +1110,76 @@ def reset_config(quiet: bool = False) -> bool:
     return True
 
 
+def _local_repo_path(remote_url: str) -> Optional[Path]:
+    """Return the directory a clone URL points at, or None if it is not local."""
+    path = remote_url
+    if path.startswith("file://"):
+        path = path[len("file://") :]
+    local_path = Path(path)
+    return local_path if local_path.is_dir() else None
+
+
+def _replace_with_symlink(link_path: Path, target: Path) -> None:
+    """
+    Point link_path at target, atomically replacing any file or symlink already
+    there, by renaming a freshly created symlink over it. The temporary link
+    gets a random name that is retried until unused, so no existing file in
+    the directory is ever removed.
+    """
+    while True:
+        tmp_link = link_path.with_name(
+            f"{link_path.name}.{secrets.token_hex(8)}.dotz-tmp"
+        )
+        try:
+            tmp_link.symlink_to(target)
+            break
+        except FileExistsError:
+            continue
+    try:
+        os.replace(tmp_link, link_path)
+    except OSError:
+        tmp_link.unlink(missing_ok=True)
+        raise
+
+
+def _restore_cloned_file(
+    file_path: str,
+) -> Tuple[bool, Optional[Path], Optional[str]]:
+    """
+    Symlink one file from a freshly cloned repo into the home directory,
+    backing up whatever was there. Safe to run from worker threads: it prints
+    nothing and returns (restored, backup_path, error) for the caller to report.
+    """
+    try:
+        rel_path = Path(file_path)
+        home_path = HOME / rel_path
+        repo_path = WORK_TREE / rel_path
+
+        # Skip if the file doesn't exist in the repo (shouldn't happen)
+        if not repo_path.exists():
+            return False, None, None
+
+        # Back up anything real that the symlink will replace, and leave it
+        # untouched if that fails. Directories have to be removed first;
+        # files and symlinks are replaced in place.
+        backup_path = None
+        if not home_path.is_symlink() and home_path.exists():
+            backup_path = create_backup(home_path, operation="clone", quiet=True)
+            if backup_path is None:
+                return False, None, "could not back up the existing file; left as is"
+            if home_path.is_dir():
+                shutil.rmtree(home_path)
+
+        # Ensure parent directory exists
+        home_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Create symlink from home to repo
+        _replace_with_symlink(home_path, repo_path)
+        return True, backup_path, None
+    except Exception as e:
+        return False, None, str(e)
+
+
 def clone_repo(remote_url: str, quiet: bool = False) -> bool:
     """
     Clone an existing dotz repository from a remote URL and automatically restore
@@ -1008,8 +1205,16 @@ def clone_repo(remote_url: str, quiet: bool = False) -> bool:
         # Create dotz directory
         DOTZ_DIR.mkdir(parents=True, exist_ok=True)
 
-        # Clone the repository
-        repo = Repo.clone_from(remote_url, str(WORK_TREE))
+        # Clone the repository. For a repository on this machine, pass --local
+        # so git hardlinks the object store instead of copying it through
+        # a transport (which it otherwise does for file:// URLs).
+        local_source = _local_repo_path(remote_url)
+        if local_source is not None:
+            repo = Repo.clone_from(str(local_source), str(WORK_TREE), local=True)
+            # Keep the URL the user gave, e.g. file://, rather than the bare path
+            repo.remote("origin").set_url(remote_url)
+        else:
+            repo = Repo.clone_from(remote_url, str(WORK_TREE))
 
         if not quiet:
             typer.secho("✓ Repository cloned successfully", fg=typer.colors.GREEN)
@@ -1033,50 +1238,32 @@ def clone_repo(remote_url: str, quiet: bool = False) -> bool:
                 fg=typer.colors.CYAN,
             )
 
-        # Restore all tracked files
+        # Restore all tracked files; each one is an independent set of
+        # filesystem calls, so overlap them on a thread pool
         restored_count = 0
         failed_files = []
 
-        for file_path in tracked_files:
-            try:
-                # Create Path object relative to home
-                rel_path = Path(file_path)
-                home_path = HOME / rel_path
-                repo_path = WORK_TREE / rel_path
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(_restore_cloned_file, tracked_files))
 
-                # Skip if the file doesn't exist in the repo (shouldn't happen)
-                if not repo_path.exists():
-                    continue
-
-                # Remove existing file/symlink/directory if it exists
-                if home_path.exists() or home_path.is_symlink():
-                    if home_path.is_symlink():
-                        home_path.unlink()
-                    else:
-                        # Create backup before removing
-                        create_backup(home_path, operation="clone", quiet=quiet)
-                        if home_path.is_file():
-                            home_path.unlink()
-                        elif home_path.is_dir():
-                            shutil.rmtree(home_path)
-
-                # Ensure parent directory exists
-                home_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Create symlink from home to repo
-                home_path.symlink_to(repo_path)
-
-                restored_count += 1
-                if not quiet:
-                    typer.secho(f"  ✓ Restored {rel_path}", fg=typer.colors.GREEN)
-
-            except Exception as e:
-                failed_files.append((file_path, str(e)))
+        for file_path, (restored, backup_path, error) in zip(tracked_files, results):
+            if error is not None:
+                failed_files.append((file_path, error))
                 if not quiet:
                     typer.secho(
-                        f"  ! Failed to restore {file_path}: {e}",
+                        f"  ! Failed to restore {file_path}: {error}",
                         fg=typer.colors.YELLOW,
                     )
+                continue
+            if not quiet and backup_path is not None:
+                typer.secho(
+                    f"Backed up {file_path} to backups/{backup_path.name}",
+                    fg=typer.colors.BLUE,
+                )
+            if restored:
+                restored_count += 1
+                if not quiet:
+                    typer.secho(f"  ✓ Restored {file_path}", fg=typer.colors.GREEN)
 
         # Summary
         if not quiet:
@@ -1866,9 +2053,11 @@ def find_config_files_with_progress(
     if len(files_to_check) < PROGRESS_THRESHOLD:
         return find_config_files(directory, config, recursive)
 
-    include_patterns = config["file_patterns"]["include"]
-    exclude_patterns = config["file_patterns"]["exclude"]
-    case_sensitive = config["search_settings"]["case_sensitive"]
+    matches = _pattern_matcher(
+        config["file_patterns"]["include"],
+        config["file_patterns"]["exclude"],
+        config["search_settings"]["case_sensitive"],
+    )
     follow_symlinks = config["search_settings"]["follow_symlinks"]
 
     found_files = []
@@ -1889,9 +2078,7 @@ def find_config_files_with_progress(
                 progress.advance(task)
                 continue
 
-            if matches_patterns(
-                file_path.name, include_patterns, exclude_patterns, case_sensitive
-            ):
+            if matches(file_path.name):
                 found_files.append(file_path)
 
             progress.advance(task)
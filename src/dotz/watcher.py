@@ -1,6 +1,5 @@
 """File system watcher for automatically tracking new dotfiles."""
 
-import json
 import os
 import time
 from pathlib import Path
@@ -9,7 +8,14 @@ from typing import Dict, List, Optional
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
-from .core import add_dotfile, ensure_repo, get_home_dir, load_config, matches_patterns
+from .core import (
+    _json_loads,
+    add_dotfile,
+    ensure_repo,
+    get_home_dir,
+    load_config,
+    matches_patterns,
+)
 
 
 def get_watcher_paths(home_dir: Optional[Path] = None) -> Dict[str, Path]:
@@ -61,10 +67,9 @@ def get_tracked_dirs() -> List[str]:
     if not tracked_file.exists():
         return []
     try:
-        with open(tracked_file, "r") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except (json.JSONDecodeError, IOError):
+        data = _json_loads(tracked_file.read_bytes())
+        return data if isinstance(data, list) else []
+    except (ValueError, IOError):
         return []
 
 
@@ -1,17 +1,180 @@
-"""Shared pytest fixtures and configuration."""
+"""Shared pytest fixtures and configuration.
 
-import tempfile
+GitPython probes for a git executable when it is first imported. The probe is
+told to stay quiet and is pointed at the git on PATH before dotz is imported,
+falling back to /bin/true so that mocked tests still import on machines
+without git. Either variable can be overridden from the environment.
+"""
+
+import copy
+import os
+import shutil
 from pathlib import Path
 from typing import Generator
+from unittest.mock import MagicMock
 
 import pytest
 
+os.environ.setdefault("GIT_PYTHON_REFRESH", "quiet")
+os.environ.setdefault("GIT_PYTHON_GIT_EXECUTABLE", shutil.which("git") or "/bin/true")
+
+from git import IndexFile, PushInfo, Remote, Repo  # noqa: E402
+
+from dotz import cli, core  # noqa: E402
+
+from .helpers import (  # noqa: E402
+    CLI_PATH_GLOBALS,
+    SOURCE_DOTFILES,
+    DotzLayout,
+    commit_files,
+    create_test_files,
+    empty_archive,
+    link_git_objects,
+    preserve_dotz_paths,
+    use_dotz_home,
+)
+
 
 @pytest.fixture
-def temp_home() -> Generator[Path, None, None]:
+def preserved_dotz_paths() -> Generator[None, None, None]:
+    """Undo any update_paths() call made by the test during teardown."""
+    with preserve_dotz_paths():
+        yield
+
+
+@pytest.fixture
+def temp_home(tmp_path: Path) -> Path:
     """Create a temporary home directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
+
+
+@pytest.fixture
+def dotz_env(
+    temp_home: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Path, None, None]:
+    """Point $HOME and the cached dotz paths at the temporary home directory."""
+    monkeypatch.setenv("HOME", str(temp_home))
+    with use_dotz_home(temp_home):
+        for name in CLI_PATH_GLOBALS:
+            monkeypatch.setattr(cli, name, getattr(core, name))
+        yield temp_home
+
+
+@pytest.fixture(scope="session")
+def dotz_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Initialize a dotz repository once per session for tests to copy."""
+    home = tmp_path_factory.mktemp("dotz_template")
+    with use_dotz_home(home):
+        core.init_repo(quiet=True)
+    return home
+
+
+@pytest.fixture(scope="session")
+def source_repo(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Build a dotz repository tracking SOURCE_DOTFILES once per session.
+
+    Tests only clone from this repository and must not modify it.
+    """
+    home = tmp_path_factory.mktemp("source_home")
+    with use_dotz_home(home):
+        core.init_repo(quiet=True)
+        work_tree = core.WORK_TREE
+        repo = core.ensure_repo()
+
+    # Stage every file and commit once rather than one add_dotfile() commit each
+    create_test_files(work_tree, SOURCE_DOTFILES)
+    commit_files(repo, SOURCE_DOTFILES, "Add source dotfiles")
+    return work_tree
+
+
+@pytest.fixture
+def dotz_layout(dotz_env: Path) -> DotzLayout:
+    """Provide the dotz paths for the temporary home directory."""
+    return DotzLayout.for_home(dotz_env)
+
+
+@pytest.fixture
+def initialized_dotz(dotz_layout: DotzLayout, dotz_template: Path) -> DotzLayout:
+    """Provide a home directory with its own copy of an initialized dotz repo."""
+    shutil.copytree(
+        dotz_template / core.DOTZ_DIR_NAME,
+        dotz_layout.dotz_dir,
+        symlinks=True,
+        copy_function=link_git_objects,
+    )
+    return dotz_layout
+
+
+@pytest.fixture
+def repo(initialized_dotz: DotzLayout) -> Repo:
+    """Open the initialized dotz repository once for the test."""
+    return core.ensure_repo()
+
+
+@pytest.fixture
+def mocked_git(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace dotz.core.Repo with a MagicMock so no git process is started."""
+    repo_cls = MagicMock(name="Repo")
+    monkeypatch.setattr(core, "Repo", repo_cls)
+    return repo_cls
+
+
+@pytest.fixture
+def fast_backup(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Skip tar/gzip work in create_backup for tests that only check the result.
+
+    Directory backups become empty files; do not use this for restore tests.
+    """
+    tar_open = MagicMock(name="tarfile.open", side_effect=empty_archive)
+    monkeypatch.setattr(core.tarfile, "open", tar_open)
+    return tar_open
+
+
+@pytest.fixture
+def no_commit(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Turn git commits into a no-op for tests that only check the file system.
+
+    Files are still staged in the index; no commit object is written.
+    """
+    commit = MagicMock(name="IndexFile.commit")
+    monkeypatch.setattr(IndexFile, "commit", commit)
+    return commit
+
+
+@pytest.fixture
+def mock_push(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Make every git push succeed without contacting a remote.
+
+    Override return_value or side_effect to simulate rejected or failed pushes.
+    """
+    push = MagicMock(name="Remote.push")
+    push.return_value = [MagicMock(flags=0, ERROR=PushInfo.ERROR, summary="ok")]
+    monkeypatch.setattr(Remote, "push", push)
+    return push
+
+
+@pytest.fixture
+def mocked_repo(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Replace core.ensure_repo with a MagicMock repository that has no remotes.
+
+    Remotes added with create_remote() are returned by repo.remote(name).
+    """
+    repo = MagicMock(name="repo")
+    repo.remotes = []
+
+    def create_remote(name: str, url: str) -> MagicMock:
+        remote = MagicMock(name=f"remote {name}")
+        remote.name = name
+        remote.url = url
+        repo.remotes.append(remote)
+        return remote
+
+    repo.create_remote.side_effect = create_remote
+    repo.remote.side_effect = lambda name="origin": next(
+        remote for remote in repo.remotes if remote.name == name
+    )
+    monkeypatch.setattr(core, "ensure_repo", lambda: repo)
+    return repo
 
 
 @pytest.fixture
@@ -24,6 +187,15 @@ def temp_dotz_dir(temp_home: Path) -> Path:
     return dotz_dir
 
 
+@pytest.fixture(scope="session")
+def default_config() -> dict:
+    """Snapshot of dotz's default configuration, shared by the whole session.
+
+    Compare against it but do not modify it.
+    """
+    return copy.deepcopy(core.DEFAULT_CONFIG)
+
+
 @pytest.fixture
 def sample_config() -> dict:
     """Sample configuration for testing."""
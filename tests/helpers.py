@@ -0,0 +1,119 @@
+"""Constants and helper functions shared by the test modules and fixtures.
+
+Fixtures live in conftest.py; import everything else from here.
+"""
+
+import os
+import shutil
+import stat
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+from unittest.mock import MagicMock
+
+from git import Actor, Repo
+
+from dotz import core
+
+# Module-level path globals set by core.update_paths() and copied into cli
+CORE_PATH_GLOBALS = (
+    "HOME",
+    "DOTZ_DIR",
+    "WORK_TREE",
+    "TRACKED_DIRS_FILE",
+    "CONFIG_FILE",
+    "BACKUP_DIR",
+)
+CLI_PATH_GLOBALS = ("HOME", "DOTZ_DIR", "WORK_TREE")
+
+# Fixed identity for test commits, so GitPython never reads user.name/email
+TEST_ACTOR = Actor("dotz tests", "tests@dotz.invalid")
+
+# Files tracked in the session-wide source repository, relative to $HOME
+SOURCE_DOTFILES = {
+    ".bashrc": "# bashrc from source repo\n",
+    ".gitconfig": "[user]\n\tname = source\n",
+    ".config/app.conf": "key=value\n",
+}
+
+
+@dataclass(frozen=True)
+class DotzLayout:
+    """Paths of a dotz installation under a test home directory."""
+
+    home: Path
+    dotz_dir: Path
+    work_tree: Path
+    tracked_dirs_file: Path
+    config_file: Path
+    backup_dir: Path
+
+    @classmethod
+    def for_home(cls, home: Path) -> "DotzLayout":
+        """Build the layout dotz uses for home."""
+        return cls(**core.get_dotz_paths(home))
+
+
+def create_test_files(root: Path, files: Dict[str, str]) -> None:
+    """Create files, and any missing parent directories, under root."""
+    paths = {root / name: content for name, content in files.items()}
+    for parent in {path.parent for path in paths}:
+        parent.mkdir(parents=True, exist_ok=True)
+    for path, content in paths.items():
+        path.write_bytes(content.encode())
+
+
+def commit_files(
+    repo: Repo, paths: Iterable[str], message: str = "Test commit"
+) -> None:
+    """Stage paths relative to the work tree and record them in a single commit."""
+    repo.index.add([str(path) for path in paths])
+    repo.index.commit(message, author=TEST_ACTOR, committer=TEST_ACTOR)
+
+
+def assert_symlink_correct(home_file: Path, dotz_file: Path) -> None:
+    """Assert that home_file is a symlink whose stored target is dotz_file."""
+    assert stat.S_ISLNK(os.lstat(home_file).st_mode)
+    assert os.readlink(home_file) == str(dotz_file)
+
+
+def link_git_objects(src: str, dst: str) -> None:
+    """Hardlink immutable git objects and copy every other file.
+
+    Other files, such as tracked_dirs.json, are rewritten in place by dotz and
+    must not be shared with the session template.
+    """
+    if f"{os.sep}.git{os.sep}objects{os.sep}" in src:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+@contextmanager
+def preserve_dotz_paths() -> Iterator[None]:
+    """Restore core's path globals on exit, however they were changed."""
+    original = {name: getattr(core, name) for name in CORE_PATH_GLOBALS}
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            setattr(core, name, value)
+
+
+@contextmanager
+def use_dotz_home(home: Path) -> Iterator[None]:
+    """Temporarily point core's path globals at another home directory."""
+    with preserve_dotz_paths():
+        core.update_paths(home)
+        yield
+
+
+@contextmanager
+def empty_archive(name: Path, mode: str = "r") -> Iterator[MagicMock]:
+    """Stand in for tarfile.open, leaving an empty file instead of an archive."""
+    yield MagicMock(name="TarFile")
+    Path(name).write_bytes(b"")
@@ -1,107 +1,149 @@
 """Tests for dotz CLI functionality."""
 
-from unittest.mock import Mock, patch
-
 import pytest
 from typer.testing import CliRunner
 
 from dotz.cli import app
 
+runner = CliRunner()
+
+
+@pytest.fixture(scope="session")
+def help_output():
+    """Return the output of ``dotz <args> --help``, invoking each only once."""
+    cache = {}
+
+    def get(*args: str) -> str:
+        if args not in cache:
+            result = runner.invoke(app, [*args, "--help"])
+            assert result.exit_code == 0
+            cache[args] = result.stdout
+        return cache[args]
+
+    return get
+
 
 class TestCLIBasics:
     """Test basic CLI functionality."""
 
-    def setup_method(self):
-        """Set up test runner."""
-        self.runner = CliRunner()
-
-    def test_cli_help(self):
+    def test_cli_help(self, help_output):
         """Test CLI help command."""
-        result = self.runner.invoke(app, ["--help"])
-        assert result.exit_code == 0
-        assert "dotz - a Git-backed dotfiles manager" in result.stdout
+        assert "dotz - a Git-backed dotfiles manager" in help_output()
+
+    def test_clone_command_exists(self, help_output):
+        """Test clone command is registered and documented."""
+        assert "clone" in help_output()
+        assert "Clone" in help_output("clone")
 
     def test_version_command(self):
         """Test version command."""
-        result = self.runner.invoke(app, ["version"])
+        result = runner.invoke(app, ["version"])
         assert result.exit_code == 0
         assert "0.4.0" in result.stdout
 
     def test_completion_command(self):
         """Test completion command."""
-        result = self.runner.invoke(app, ["completion"])
+        result = runner.invoke(app, ["completion"])
         assert result.exit_code == 0
-        assert (
-            "install-completion" in result.stdout.lower()
-            or "shell completion" in result.stdout.lower()
-        )
+        output = result.stdout.lower()
+        assert "install-completion" in output or "shell completion" in output
 
 
 class TestCLICommands:
     """Test CLI commands that require mocking."""
 
-    def setup_method(self):
-        """Set up test runner."""
-        self.runner = CliRunner()
-
-    def test_diagnose_command(self):
-        """Test diagnose command runs without error."""
-        result = self.runner.invoke(app, ["diagnose"])
-        # Just verify it doesn't crash - the output will vary by system
+    def test_diagnose_command(self, dotz_env):
+        """Test diagnose command against an uninitialized home directory."""
+        result = runner.invoke(app, ["diagnose"])
         assert result.exit_code == 0
+        assert "not initialized" in result.stdout
 
-    @patch("dotz.cli.get_repo_status")
-    def test_status_command_no_repo(self, mock_status):
+    def test_status_command_no_repo(self, mocker):
         """Test status command when no repository exists."""
         from dotz.exceptions import DotzRepositoryNotFoundError
 
-        mock_status.side_effect = DotzRepositoryNotFoundError("No repository found")
-        result = self.runner.invoke(app, ["status"])
+        mocker.patch(
+            "dotz.cli.get_repo_status",
+            side_effect=DotzRepositoryNotFoundError("No repository found"),
+        )
+        result = runner.invoke(app, ["status"])
         assert result.exit_code != 0
-        assert "No repository found" in result.stdout
+        assert "No repository found" in result.output
 
-    @patch("dotz.cli.list_tracked_files")
-    @patch("dotz.cli.get_dotz_paths")
-    def test_list_files_command(self, mock_paths, mock_list):
+    def test_list_files_command(self, mocker):
         """Test list-files command."""
-        mock_paths.return_value = {"repo_dir": "/fake/path"}
-        mock_list.return_value = ["/home/user/.bashrc", "/home/user/.vimrc"]
+        mocker.patch("dotz.cli.get_dotz_paths", return_value={"repo_dir": "/fake/path"})
+        mock_list = mocker.patch(
+            "dotz.cli.list_tracked_files",
+            return_value=["/home/user/.bashrc", "/home/user/.vimrc"],
+        )
 
-        result = self.runner.invoke(app, ["list-files"])
+        result = runner.invoke(app, ["list-files"])
         assert result.exit_code == 0
         mock_list.assert_called_once()
 
 
+class TestCLIWithRepository:
+    """Test read-only CLI commands against an initialized repository."""
+
+    def test_status_clean_repository(self, initialized_dotz):
+        """Test status command on a freshly initialized repository."""
+        result = runner.invoke(app, ["status"])
+        assert result.exit_code == 0
+        assert "Repository is clean" in result.stdout
+
+    def test_diagnose_lists_tracked_dirs(self, initialized_dotz):
+        """Test diagnose reports tracked directories, including non-ASCII ones."""
+        from dotz.core import save_tracked_dir
+
+        save_tracked_dir(initialized_dotz.home / "Résumé")
+
+        result = runner.invoke(app, ["diagnose"])
+        assert result.exit_code == 0
+        assert f"Tracked directories: {initialized_dotz.home / 'Résumé'}" in (
+            result.stdout
+        )
+
+    def test_list_files_empty_repository(self, initialized_dotz):
+        """Test list-files command when nothing is tracked yet."""
+        result = runner.invoke(app, ["list-files"])
+        assert result.exit_code == 0
+        assert "No files tracked by dotz." in result.stdout
+
+
 class TestConfigCommands:
     """Test configuration-related CLI commands."""
 
-    def setup_method(self):
-        """Set up test runner."""
-        self.runner = CliRunner()
-
-    @patch("dotz.cli.load_config")
-    def test_config_show(self, mock_load):
+    def test_config_show(self, mocker):
         """Test config show command."""
         mock_config = {
             "include_patterns": [".*"],
             "exclude_patterns": [".git"],
         }
-        mock_load.return_value = mock_config
+        mock_load = mocker.patch("dotz.cli.load_config", return_value=mock_config)
 
-        result = self.runner.invoke(app, ["config", "show"])
+        result = runner.invoke(app, ["config", "show"])
         assert result.exit_code == 0
         mock_load.assert_called_once()
 
-    @patch("dotz.cli.add_file_pattern")
-    def test_config_add_pattern(self, mock_add):
+    def test_config_reset_without_confirmation(self, mocker):
+        """Test config reset is cancelled when the prompt is declined."""
+        mock_reset = mocker.patch("dotz.cli.reset_config")
+        result = runner.invoke(app, ["config", "reset"], input="n\n")
+        assert result.exit_code == 0
+        assert "Reset cancelled." in result.stdout
+        mock_reset.assert_not_called()
+
+    def test_config_add_pattern(self, mocker):
         """Test config add-pattern command."""
-        result = self.runner.invoke(app, ["config", "add-pattern", "*.py"])
+        mock_add = mocker.patch("dotz.cli.add_file_pattern")
+        result = runner.invoke(app, ["config", "add-pattern", "*.py"])
         assert result.exit_code == 0
         mock_add.assert_called_once_with("*.py", "include")
 
-    @patch("dotz.cli.remove_file_pattern")
-    def test_config_remove_pattern(self, mock_remove):
+    def test_config_remove_pattern(self, mocker):
         """Test config remove-pattern command."""
-        result = self.runner.invoke(app, ["config", "remove-pattern", "*.log"])
+        mock_remove = mocker.patch("dotz.cli.remove_file_pattern")
+        result = runner.invoke(app, ["config", "remove-pattern", "*.log"])
         assert result.exit_code == 0
         mock_remove.assert_called_once_with("*.log", "include")
@@ -1,44 +1,124 @@
 """Tests for dotz core functionality."""
 
 import json
+import os
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock
 
 import pytest
+from git import GitCommandError, PushInfo, Repo
 
+from dotz import core, watcher
 from dotz.core import (
+    DEFAULT_CONFIG,
+    add_dotfile,
+    add_file_pattern,
+    clone_repo,
+    create_backup,
+    find_config_files,
     get_dotz_paths,
+    init_repo,
+    list_backups,
+    list_tracked_files,
     load_config,
+    matches_patterns,
+    merge_defaults,
+    pull_repo,
+    push_repo,
+    remove_file_pattern,
+    remove_tracked_dir,
+    restore_dotfile,
     save_config,
+    save_tracked_dir,
+    update_paths,
     validate_file_patterns,
 )
 from dotz.exceptions import DotzRepositoryNotFoundError
 
+from .helpers import (
+    SOURCE_DOTFILES,
+    DotzLayout,
+    assert_symlink_correct,
+    commit_files,
+    create_test_files,
+)
+
+FAKE_HOME = Path("/home/user")
+
 
 class TestDotzPaths:
     """Test dotz path management."""
 
-    def test_get_dotz_paths_default(self):
+    def test_get_dotz_paths_default(self, mocker):
         """Test default dotz paths creation."""
-        with patch("dotz.core.get_home_dir") as mock_home:
-            mock_home.return_value = Path("/home/user")
-            paths = get_dotz_paths()
+        mocker.patch("dotz.core.get_home_dir", return_value=FAKE_HOME)
+        paths = get_dotz_paths()
 
-            assert paths["dotz_dir"] == Path("/home/user/.dotz")
-            assert paths["work_tree"] == Path("/home/user/.dotz/repo")
-            assert paths["config_file"] == Path("/home/user/.dotz/config.json")
-            assert paths["backup_dir"] == Path("/home/user/.dotz/backups")
+        dotz_dir = FAKE_HOME / ".dotz"
+        assert paths["dotz_dir"] == dotz_dir
+        assert paths["work_tree"] == dotz_dir / "repo"
+        assert paths["config_file"] == dotz_dir / "config.json"
+        assert paths["backup_dir"] == dotz_dir / "backups"
 
-    def test_get_dotz_paths_custom_home(self, temp_home: Path):
+    def test_get_dotz_paths_custom_home(self, temp_home: Path, mocker):
         """Test dotz paths with custom home directory."""
-        with patch("dotz.core.get_home_dir") as mock_home:
-            mock_home.return_value = temp_home
-            paths = get_dotz_paths()
+        mocker.patch("dotz.core.get_home_dir", return_value=temp_home)
+        paths = get_dotz_paths()
+
+        assert paths["dotz_dir"] == temp_home / ".dotz"
+        assert paths["work_tree"] == temp_home / ".dotz" / "repo"
+
+    def test_get_dotz_paths_follows_home_changes(self, temp_home: Path):
+        """Test cached layouts are per home and returned as independent dicts."""
+        first = get_dotz_paths(temp_home)
+        first["dotz_dir"] = Path("/elsewhere")
+
+        assert get_dotz_paths(temp_home)["dotz_dir"] == temp_home / ".dotz"
+        other_home = temp_home / "other"
+        assert get_dotz_paths(other_home)["dotz_dir"] == other_home / ".dotz"
+
+    def test_update_paths(self, temp_home: Path, preserved_dotz_paths):
+        """Test that update_paths repoints every core path global."""
+        update_paths(temp_home)
+
+        assert core.HOME == temp_home
+        assert core.DOTZ_DIR == temp_home / ".dotz"
+        assert core.WORK_TREE == temp_home / ".dotz" / "repo"
+        assert core.TRACKED_DIRS_FILE == temp_home / ".dotz" / "tracked_dirs.json"
+        assert core.CONFIG_FILE == temp_home / ".dotz" / "config.json"
+        assert core.BACKUP_DIR == temp_home / ".dotz" / "backups"
+
+
+class TestInitRepo:
+    """Test repository initialization."""
+
+    @pytest.mark.slow
+    def test_init_repo_basic(self, dotz_env: Path):
+        """Test that init_repo creates the full dotz layout."""
+        assert init_repo(quiet=True)
 
-            assert paths["dotz_dir"] == temp_home / ".dotz"
-            assert paths["work_tree"] == temp_home / ".dotz" / "repo"
+        dotz_dir = dotz_env / ".dotz"
+        assert (dotz_dir / "repo" / ".git").is_dir()
+        assert (dotz_dir / "backups").is_dir()
+        assert json.loads((dotz_dir / "tracked_dirs.json").read_text()) == []
+        assert json.loads((dotz_dir / "config.json").read_text()) == DEFAULT_CONFIG
 
+    def test_init_repo_with_remote(self, dotz_env: Path, mocked_git):
+        """Test that a remote passed to init_repo is added as origin."""
+        remote = "git@github.com:user/dotfiles.git"
 
+        assert init_repo(remote=remote, quiet=True)
+
+        mocked_git.init.assert_called_once_with(str(dotz_env / ".dotz" / "repo"))
+        repo = mocked_git.init.return_value
+        repo.create_remote.assert_called_once_with("origin", remote)
+
+    def test_init_repo_already_exists(self, initialized_dotz: DotzLayout):
+        """Test that init_repo refuses to reinitialize an existing repository."""
+        assert not init_repo(quiet=True)
+
+
+@pytest.mark.usefixtures("dotz_env")
 class TestConfiguration:
     """Test configuration management."""
 
@@ -47,43 +127,222 @@ class TestConfiguration:
         config_file = temp_dotz_dir / "config.json"
         config_file.write_text(json.dumps(sample_config))
 
-        with patch("dotz.core.CONFIG_FILE", config_file):
-            config = load_config()
+        config = load_config()
 
         # The loaded config will be merged with defaults
         assert "file_patterns" in config
         assert "search_settings" in config
 
-    def test_load_config_file_not_exists(self, temp_dotz_dir: Path):
+    def test_load_config_file_not_exists(
+        self, temp_dotz_dir: Path, default_config: dict
+    ):
         """Test loading configuration when file doesn't exist returns defaults."""
-        config_file = temp_dotz_dir / "config.json"
+        assert load_config() == default_config
 
-        with (
-            patch("dotz.core.CONFIG_FILE", config_file),
-            patch("dotz.core.DOTZ_DIR", temp_dotz_dir),
-        ):
-            config = load_config()
+    @pytest.mark.parametrize("content", ["{not json", "[]", '"text"', "null"])
+    def test_load_config_invalid_json(
+        self, temp_dotz_dir: Path, default_config: dict, content: str
+    ):
+        """Test that a corrupt or non-object config file is replaced by defaults."""
+        config_file = temp_dotz_dir / "config.json"
+        config_file.write_text(content)
 
-        # Should return default configuration
-        assert "file_patterns" in config
-        assert "search_settings" in config
-        assert isinstance(config["file_patterns"]["include"], list)
+        assert load_config() == default_config
+        assert json.loads(config_file.read_text()) == default_config
 
     def test_save_config(self, temp_dotz_dir: Path, sample_config: dict):
         """Test saving configuration to file."""
         config_file = temp_dotz_dir / "config.json"
 
-        with (
-            patch("dotz.core.CONFIG_FILE", config_file),
-            patch("dotz.core.DOTZ_DIR", temp_dotz_dir),
-        ):
-            save_config(sample_config)
+        save_config(sample_config)
 
         # Verify file was created and contains correct data
         assert config_file.exists()
         saved_config = json.loads(config_file.read_text())
         assert saved_config == sample_config
 
+    def test_save_config_unchanged_skips_write(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that saving an identical config leaves the file untouched."""
+        config_file = temp_dotz_dir / "config.json"
+        save_config(sample_config)
+        before = config_file.stat()
+
+        save_config(sample_config)
+
+        after = config_file.stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        assert [p.name for p in temp_dotz_dir.iterdir() if p.is_file()] == [
+            "config.json"
+        ]
+
+    def test_save_config_keeps_symlinked_config(
+        self, temp_home: Path, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that saving writes through a symlinked config.json."""
+        real_config = temp_home / "dotfiles" / "dotz.json"
+        create_test_files(temp_home, {"dotfiles/dotz.json": "{}"})
+        config_file = temp_dotz_dir / "config.json"
+        config_file.symlink_to(real_config)
+
+        save_config(sample_config)
+
+        assert_symlink_correct(config_file, real_config)
+        assert json.loads(real_config.read_text()) == sample_config
+        assert sorted(real_config.parent.iterdir()) == [real_config]
+
+    def test_save_config_failed_write_removes_tmp_file(
+        self, temp_dotz_dir: Path, sample_config: dict, mocker
+    ):
+        """Test that a failed write leaves no temporary file behind."""
+        mocker.patch("os.replace", side_effect=OSError("No space left on device"))
+
+        with pytest.raises(OSError):
+            save_config(sample_config)
+
+        assert list(temp_dotz_dir.glob("config.json*")) == []
+
+    def test_save_config_preserves_mode(self, temp_dotz_dir: Path, sample_config: dict):
+        """Test that rewriting config.json keeps its permissions."""
+        config_file = temp_dotz_dir / "config.json"
+        save_config(sample_config)
+        config_file.chmod(0o600)
+
+        save_config({**sample_config, "extra": True})
+
+        assert config_file.stat().st_mode & 0o777 == 0o600
+        assert json.loads(config_file.read_text())["extra"] is True
+
+    def test_save_config_new_file_uses_umask(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that a new config.json gets the usual mode, not mkstemp's."""
+        umask = os.umask(0o022)
+        try:
+            save_config(sample_config)
+        finally:
+            os.umask(umask)
+
+        assert (temp_dotz_dir / "config.json").stat().st_mode & 0o777 == 0o644
+
+    def test_save_config_keeps_unrelated_tmp_file(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that a file named config.json.tmp is never touched."""
+        unrelated = temp_dotz_dir / "config.json.tmp"
+        unrelated.write_text("not ours\n")
+
+        save_config(sample_config)
+
+        assert unrelated.read_text() == "not ours\n"
+        assert sorted(p.name for p in temp_dotz_dir.glob("config.json*")) == [
+            "config.json",
+            "config.json.tmp",
+        ]
+
+    def test_load_config_sees_saved_changes(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that a cached config is not served after save_config."""
+        save_config(sample_config)
+        assert load_config()["search_settings"]["recursive"] is True
+
+        sample_config["search_settings"]["recursive"] = False
+        save_config(sample_config)
+        assert load_config()["search_settings"]["recursive"] is False
+
+    def test_load_config_reuses_parsed_file(
+        self, temp_dotz_dir: Path, sample_config: dict, mocker
+    ):
+        """Test that config.json is parsed once until it is saved again."""
+        save_config(sample_config)
+        json_loads = mocker.patch("dotz.core._json_loads", wraps=core._json_loads)
+
+        load_config()
+        load_config()
+        assert json_loads.call_count == 1
+
+        save_config({**sample_config, "extra": True})
+        assert load_config()["extra"] is True
+        assert json_loads.call_count == 2
+
+    def test_save_config_non_ascii_pattern(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that non-ASCII patterns are written as UTF-8 and read back."""
+        sample_config["file_patterns"]["include"].append("*.résumé")
+
+        save_config(sample_config)
+
+        data = (temp_dotz_dir / "config.json").read_bytes()
+        assert json.loads(data.decode("utf-8")) == sample_config
+        assert "*.résumé" in load_config()["file_patterns"]["include"]
+
+    def test_load_config_returns_independent_copies(
+        self, temp_dotz_dir: Path, sample_config: dict
+    ):
+        """Test that mutating a loaded config does not affect later loads."""
+        config_file = temp_dotz_dir / "config.json"
+        config_file.write_text(json.dumps(sample_config))
+
+        load_config()["file_patterns"]["include"].append("*.py")
+        config = load_config()
+
+        assert "*.py" not in config["file_patterns"]["include"]
+
+    def test_merge_defaults_fills_missing_keys(self):
+        """Test that partial nested sections are completed from the defaults."""
+        custom_config = {
+            "file_patterns": {"include": ["*.py"]},
+            "search_settings": {"recursive": False},
+            "extra": {"kept": True},
+        }
+
+        merged = merge_defaults(custom_config)
+
+        assert merged["file_patterns"]["include"] == ["*.py"]
+        assert merged["file_patterns"]["exclude"] == (
+            DEFAULT_CONFIG["file_patterns"]["exclude"]
+        )
+        assert merged["search_settings"] == {
+            **DEFAULT_CONFIG["search_settings"],
+            "recursive": False,
+        }
+        assert merged["extra"] == {"kept": True}
+
+    def test_merge_defaults_does_not_share_state(self):
+        """Test that the merged config shares no mutable state with inputs."""
+        custom_config = {"file_patterns": {"include": ["*.py"]}}
+
+        merged = merge_defaults(custom_config)
+        merged["file_patterns"]["include"].append("*.pyc")
+        merged["file_patterns"]["exclude"].append("*.bak")
+
+        assert custom_config == {"file_patterns": {"include": ["*.py"]}}
+        assert "*.bak" not in DEFAULT_CONFIG["file_patterns"]["exclude"]
+
+    @pytest.mark.parametrize(
+        "operation,pattern,pattern_type,expected,present",
+        [
+            (add_file_pattern, "*.py", "include", True, True),
+            (add_file_pattern, ".*", "include", True, True),
+            (add_file_pattern, "*.pyc", "exclude", True, True),
+            (add_file_pattern, "*.py", "invalid", False, None),
+            (remove_file_pattern, "*.log", "exclude", True, False),
+            (remove_file_pattern, "*.missing", "include", False, False),
+            (remove_file_pattern, "*.log", "invalid", False, None),
+        ],
+    )
+    def test_file_pattern_operations(
+        self, temp_dotz_dir: Path, operation, pattern, pattern_type, expected, present
+    ):
+        """Test adding and removing include/exclude patterns."""
+        assert operation(pattern, pattern_type, quiet=True) is expected
+        if present is not None:
+            patterns = load_config()["file_patterns"][pattern_type]
+            assert (pattern in patterns) is present
+
 
 class TestFilePatterns:
     """Test file pattern validation."""
@@ -112,15 +371,481 @@ class TestFilePatterns:
             validate_file_patterns(patterns)
 
 
+class TestPushPull:
+    """Test pushing to and pulling from the origin remote."""
+
+    @pytest.fixture
+    def origin(self, mocked_repo) -> MagicMock:
+        """Add an origin remote to the mocked repository."""
+        return mocked_repo.create_remote("origin", "git@github.com:user/dotfiles.git")
+
+    def test_pull_repo_no_origin(self, mocked_repo):
+        """Test that pulling without an origin remote fails."""
+        assert not pull_repo(quiet=True)
+
+    def test_pull_repo(self, origin):
+        """Test that pulling fetches from origin."""
+        assert pull_repo(quiet=True)
+        origin.pull.assert_called_once_with()
+
+    def test_pull_repo_no_tracking_branch(self, origin):
+        """Test that a pull error from git is reported as a failure."""
+        origin.pull.side_effect = GitCommandError(
+            "git pull", 1, stderr="There is no tracking information"
+        )
+
+        assert not pull_repo(quiet=True)
+
+    def test_push_repo_no_origin(self, mocked_repo):
+        """Test that pushing without an origin remote fails."""
+        assert not push_repo(quiet=True)
+
+    @pytest.mark.parametrize(
+        "flags,summary,expected",
+        [
+            (0, "main -> main", True),
+            (1, "[rejected] (non-fast-forward)", False),
+        ],
+    )
+    def test_push_repo(self, mocked_repo, origin, flags, summary, expected):
+        """Test that push results flagged as errors make the push fail."""
+        mocked_repo.active_branch.name = "main"
+        origin.push.return_value = [MagicMock(flags=flags, ERROR=1, summary=summary)]
+
+        assert push_repo(quiet=True) is expected
+        origin.push.assert_called_once_with(refspec="main:main", set_upstream=True)
+
+
+@pytest.mark.usefixtures("temp_dotz_dir")
+class TestTrackedDirectories:
+    """Test the tracked_dirs.json bookkeeping."""
+
+    @pytest.mark.parametrize(
+        "operation,file_created",
+        [(save_tracked_dir, True), (remove_tracked_dir, False)],
+    )
+    def test_tracked_dir_without_file(
+        self, dotz_layout: DotzLayout, operation, file_created
+    ):
+        """Test that only saving creates a missing tracked_dirs.json."""
+        operation(dotz_layout.home / ".config" / "app")
+
+        assert dotz_layout.tracked_dirs_file.exists() is file_created
+
+    def test_save_tracked_dir(self, dotz_layout: DotzLayout):
+        """Test that saving a directory twice records it once."""
+        config_dir = dotz_layout.home / ".config" / "app"
+
+        save_tracked_dir(config_dir)
+        save_tracked_dir(config_dir)
+
+        tracked = json.loads(dotz_layout.tracked_dirs_file.read_text())
+        assert tracked == [str(config_dir)]
+
+    def test_tracked_dir_non_ascii_path(self, dotz_layout: DotzLayout):
+        """Test that non-ASCII directory names are stored as UTF-8."""
+        resume_dir = dotz_layout.home / "Résumé"
+        other_dir = dotz_layout.home / "日本語"
+
+        save_tracked_dir(resume_dir)
+        save_tracked_dir(other_dir)
+        remove_tracked_dir(other_dir)
+
+        data = dotz_layout.tracked_dirs_file.read_bytes()
+        assert json.loads(data.decode("utf-8")) == [str(resume_dir)]
+
+    def test_watcher_reads_non_ascii_tracked_dirs(
+        self, dotz_layout: DotzLayout, monkeypatch
+    ):
+        """Test that the watcher decodes tracked_dirs.json as UTF-8."""
+        monkeypatch.setattr(watcher, "DOTZ_DIR", dotz_layout.dotz_dir)
+        resume_dir = dotz_layout.home / "Résumé"
+        save_tracked_dir(resume_dir)
+
+        assert watcher.get_tracked_dirs() == [str(resume_dir)]
+
+    def test_remove_tracked_dir(self, dotz_layout: DotzLayout):
+        """Test that removing a directory leaves the others tracked."""
+        first = dotz_layout.home / ".config" / "first"
+        second = dotz_layout.home / ".config" / "second"
+        save_tracked_dir(first)
+        save_tracked_dir(second)
+
+        remove_tracked_dir(first)
+        remove_tracked_dir(dotz_layout.home / ".missing")
+
+        tracked = json.loads(dotz_layout.tracked_dirs_file.read_text())
+        assert tracked == [str(second)]
+
+
+class TestCloneRepo:
+    """Test cloning an existing dotz repository."""
+
+    def test_clone_restores_symlinks(self, dotz_layout: DotzLayout, source_repo: Path):
+        """Test that every tracked file is symlinked into the new home."""
+        assert clone_repo(str(source_repo), quiet=True)
+
+        for name, content in SOURCE_DOTFILES.items():
+            home_file = dotz_layout.home / name
+            assert_symlink_correct(home_file, dotz_layout.work_tree / name)
+            assert home_file.read_text() == content
+
+    def test_clone_from_file_url(self, dotz_layout: DotzLayout, source_repo: Path):
+        """Test cloning a local repository given as a file:// URL."""
+        assert clone_repo(source_repo.as_uri(), quiet=True)
+        assert (dotz_layout.home / ".bashrc").read_text() == SOURCE_DOTFILES[".bashrc"]
+        origin = Repo(dotz_layout.work_tree).remote("origin")
+        assert origin.url == source_repo.as_uri()
+
+    def test_clone_overwrites_existing_files(
+        self, dotz_layout: DotzLayout, source_repo: Path
+    ):
+        """Test that existing files are backed up and replaced by symlinks."""
+        existing = dotz_layout.home / ".bashrc"
+        existing.write_text("# local bashrc\n")
+        stale_link = dotz_layout.home / ".gitconfig"
+        stale_link.symlink_to(dotz_layout.home / "missing")
+
+        assert clone_repo(str(source_repo), quiet=True)
+
+        assert_symlink_correct(existing, dotz_layout.work_tree / ".bashrc")
+        assert stale_link.read_text() == SOURCE_DOTFILES[".gitconfig"]
+        assert existing.read_text() == SOURCE_DOTFILES[".bashrc"]
+        backups = list(dotz_layout.backup_dir.iterdir())
+        assert [b.read_text() for b in backups] == ["# local bashrc\n"]
+
+    def test_clone_leaves_unrelated_files_alone(
+        self, dotz_layout: DotzLayout, source_repo: Path
+    ):
+        """Test that linking never deletes files beside the restored ones."""
+        bystander = dotz_layout.home / ".bashrc.dotz-tmp"
+        bystander.write_text("not ours\n")
+
+        assert clone_repo(str(source_repo), quiet=True)
+
+        assert bystander.read_text() == "not ours\n"
+        assert list(dotz_layout.home.glob("*.dotz-tmp")) == [bystander]
+
+    def test_replace_with_symlink_skips_taken_tmp_name(self, temp_home: Path, mocker):
+        """Test that a temporary link name already in use is never reused."""
+        taken = temp_home / ".bashrc.0000.dotz-tmp"
+        taken.write_text("not ours\n")
+        mocker.patch("secrets.token_hex", side_effect=["0000", "1111"])
+
+        core._replace_with_symlink(temp_home / ".bashrc", temp_home / "target")
+
+        assert taken.read_text() == "not ours\n"
+        assert_symlink_correct(temp_home / ".bashrc", temp_home / "target")
+        assert list(temp_home.glob("*.dotz-tmp")) == [taken]
+
+    def test_clone_partial_failure_recovery(
+        self, dotz_layout: DotzLayout, source_repo: Path, mocker
+    ):
+        """Test that one file failing to link does not abort the clone."""
+        symlink_to = Path.symlink_to
+
+        def deny_bashrc(self, target, *args, **kwargs):
+            if Path(target).name == ".bashrc":
+                raise PermissionError("Permission denied")
+            return symlink_to(self, target, *args, **kwargs)
+
+        mocker.patch.object(Path, "symlink_to", deny_bashrc)
+        assert clone_repo(str(source_repo), quiet=True)
+
+        assert not (dotz_layout.home / ".bashrc").exists()
+        home, work_tree = dotz_layout.home, dotz_layout.work_tree
+        assert_symlink_correct(home / ".gitconfig", work_tree / ".gitconfig")
+        assert_symlink_correct(
+            home / ".config" / "app.conf", work_tree / ".config" / "app.conf"
+        )
+
+    def test_clone_keeps_file_when_backup_fails(
+        self, dotz_layout: DotzLayout, source_repo: Path, mocker, capsys
+    ):
+        """Test that a file whose backup fails is reported and left in place."""
+        existing = dotz_layout.home / ".bashrc"
+        existing.write_text("# local bashrc\n")
+        mocker.patch("dotz.core.create_backup", return_value=None)
+
+        assert clone_repo(str(source_repo))
+
+        assert not existing.is_symlink()
+        assert existing.read_text() == "# local bashrc\n"
+        assert_symlink_correct(
+            dotz_layout.home / ".gitconfig", dotz_layout.work_tree / ".gitconfig"
+        )
+        output = capsys.readouterr().out
+        assert "Failed to restore .bashrc: could not back up" in output
+        assert "Restored 2/3 files" in output
+
+    def test_clone_already_initialized(
+        self, initialized_dotz: DotzLayout, source_repo: Path
+    ):
+        """Test that cloning refuses to overwrite an existing dotz directory."""
+        assert not clone_repo(str(source_repo), quiet=True)
+        assert not (initialized_dotz.home / ".bashrc").exists()
+
+
+class TestAddDotfile:
+    """Test moving dotfiles into the repository and linking them back."""
+
+    def test_add_dotfile(self, initialized_dotz: DotzLayout, no_commit):
+        """Test that a file is moved into the work tree and symlinked."""
+        create_test_files(initialized_dotz.home, {".bashrc": "# bashrc\n"})
+
+        assert add_dotfile(Path(".bashrc"), quiet=True)
+
+        home_file = initialized_dotz.home / ".bashrc"
+        assert_symlink_correct(home_file, initialized_dotz.work_tree / ".bashrc")
+        assert home_file.read_text() == "# bashrc\n"
+        no_commit.assert_called_once_with("Add .bashrc")
+
+    def test_add_dotfile_already_symlinked(
+        self, initialized_dotz: DotzLayout, no_commit
+    ):
+        """Test that adding a file that is already linked changes nothing."""
+        tracked = initialized_dotz.work_tree / ".vimrc"
+        create_test_files(initialized_dotz.work_tree, {".vimrc": "set number\n"})
+        (initialized_dotz.home / ".vimrc").symlink_to(tracked)
+
+        assert add_dotfile(Path(".vimrc"), quiet=True)
+
+        assert_symlink_correct(initialized_dotz.home / ".vimrc", tracked)
+        no_commit.assert_not_called()
+
+    @pytest.mark.parametrize("push_error,expected", [(0, True), (1, False)])
+    def test_add_dotfile_with_push(
+        self, initialized_dotz: DotzLayout, repo, mock_push, push_error, expected
+    ):
+        """Test that add_dotfile pushes to origin and reports rejected pushes."""
+        repo.create_remote("origin", "git@github.com:user/dotfiles.git")
+        mock_push.return_value[0].flags = push_error * PushInfo.ERROR
+        create_test_files(initialized_dotz.home, {".bashrc": "# bashrc\n"})
+
+        assert add_dotfile(Path(".bashrc"), push=True, quiet=True) is expected
+
+        branch = repo.active_branch.name
+        mock_push.assert_called_once_with(
+            refspec=f"{branch}:{branch}", set_upstream=True
+        )
+
+    def test_add_dotfile_missing(self, initialized_dotz: DotzLayout):
+        """Test that adding a file that does not exist fails."""
+        assert not add_dotfile(Path(".missing"), quiet=True)
+
+
+class TestRestoreDotfile:
+    """Test restoring tracked dotfiles into the home directory."""
+
+    def test_restore_dotfile(self, initialized_dotz: DotzLayout, repo):
+        """Test that a tracked file is symlinked back into the home directory."""
+        create_test_files(initialized_dotz.work_tree, {".bashrc": "# bashrc\n"})
+        commit_files(repo, [".bashrc"])
+
+        assert restore_dotfile(Path(".bashrc"), quiet=True)
+
+        home_file = initialized_dotz.home / ".bashrc"
+        assert_symlink_correct(home_file, initialized_dotz.work_tree / ".bashrc")
+        assert list_tracked_files() == [".bashrc"]
+
+    # restore_dotfile only needs the file in the work tree, not a commit
+    def test_restore_dotfile_backs_up_existing_file(self, initialized_dotz: DotzLayout):
+        """Test that a real file in the way is backed up before linking."""
+        create_test_files(initialized_dotz.work_tree, {".vimrc": "set number\n"})
+        create_test_files(initialized_dotz.home, {".vimrc": "local\n"})
+
+        assert restore_dotfile(Path(".vimrc"), quiet=True)
+
+        assert (initialized_dotz.home / ".vimrc").read_text() == "set number\n"
+        backups = list(initialized_dotz.backup_dir.iterdir())
+        assert [b.read_text() for b in backups] == ["local\n"]
+
+    def test_restore_dotfile_replaces_existing_directory(
+        self, initialized_dotz: DotzLayout, fast_backup
+    ):
+        """Test that a real directory in the way is archived and replaced."""
+        create_test_files(initialized_dotz.work_tree, {".vim/vimrc": "set number\n"})
+        create_test_files(initialized_dotz.home, {".vim/local.vim": "local\n"})
+
+        assert restore_dotfile(Path(".vim"), quiet=True)
+
+        home_dir = initialized_dotz.home / ".vim"
+        assert_symlink_correct(home_dir, initialized_dotz.work_tree / ".vim")
+        assert sorted(p.name for p in home_dir.iterdir()) == ["vimrc"]
+        fast_backup.assert_called_once()
+
+    def test_restore_untracked_dotfile(self, initialized_dotz: DotzLayout):
+        """Test that restoring a file dotz does not track fails."""
+        assert not restore_dotfile(Path(".untracked"), quiet=True)
+        assert not (initialized_dotz.home / ".untracked").exists()
+
+
+class TestPatternMatching:
+    """Test include/exclude pattern matching."""
+
+    @pytest.mark.parametrize(
+        "filename,include,exclude,case_sensitive,expected",
+        [
+            ("readme.txt", ["*.txt", "*.md"], [], False, True),
+            ("script.py", ["*.txt", "*.md"], [], False, False),
+            ("notes.txt", ["*"], ["*.log", "*.tmp"], False, True),
+            ("debug.log", ["*"], ["*.log", "*.tmp"], False, False),
+            ("README.TXT", ["*.txt"], [], False, True),
+            ("readme.TXT", ["*.TXT"], [], True, True),
+            ("readme.txt", ["*.TXT"], [], True, False),
+        ],
+    )
+    def test_matches_patterns(
+        self, filename, include, exclude, case_sensitive, expected
+    ):
+        """Test include, exclude and case-sensitive pattern matching."""
+        assert matches_patterns(filename, include, exclude, case_sensitive) is expected
+
+
+class TestFindConfigFiles:
+    """Test discovery of config files in a directory."""
+
+    def test_find_config_files(self, temp_home: Path):
+        """Test non-recursive discovery with the default patterns."""
+        create_test_files(
+            temp_home,
+            {
+                ".bashrc": "content",
+                "app.conf": "content",
+                "debug.log": "content",
+                "notes.txt": "content",
+                ".config/nested.conf": "content",
+            },
+        )
+
+        found = find_config_files(temp_home, DEFAULT_CONFIG, recursive=False)
+
+        assert sorted(f.name for f in found) == [".bashrc", "app.conf"]
+
+    def test_find_config_files_recursive(self, temp_home: Path):
+        """Test recursive discovery descends into subdirectories."""
+        create_test_files(
+            temp_home,
+            {
+                ".bashrc": "content",
+                ".config/app/settings.toml": "content",
+                ".config/app/cache.tmp": "content",
+            },
+        )
+
+        found = find_config_files(temp_home, DEFAULT_CONFIG, recursive=True)
+
+        assert sorted(f.relative_to(temp_home).as_posix() for f in found) == [
+            ".bashrc",
+            ".config/app/settings.toml",
+        ]
+
+    @pytest.mark.performance
+    @pytest.mark.parametrize("file_count", [100, 1000])
+    def test_find_config_files_large_tree(self, temp_home: Path, file_count: int):
+        """Test recursive discovery matches a plain walk on a larger tree."""
+        suffixes = [".toml", ".conf", ".log", ".txt"]
+        create_test_files(
+            temp_home,
+            {
+                f"dir{i % 10}/sub{i % 3}/file{i}{suffixes[i % 4]}": "content"
+                for i in range(file_count)
+            },
+        )
+
+        found = find_config_files(temp_home, DEFAULT_CONFIG, recursive=True)
+
+        expected = {
+            Path(root, name)
+            for root, _, files in os.walk(temp_home)
+            for name in files
+            if matches_patterns(
+                name,
+                DEFAULT_CONFIG["file_patterns"]["include"],
+                DEFAULT_CONFIG["file_patterns"]["exclude"],
+            )
+        }
+        assert len(found) == len(expected) == file_count // 2
+        assert set(found) == expected
+
+    @pytest.mark.parametrize("follow_symlinks", [True, False])
+    def test_find_config_files_symlinks(self, temp_home: Path, follow_symlinks):
+        """Test that symlinked files honour follow_symlinks."""
+        create_test_files(temp_home, {"real/real.conf": "content"})
+        real_dir = temp_home / "real"
+        (temp_home / "linked.conf").symlink_to(real_dir / "real.conf")
+        (temp_home / "linked_dir").symlink_to(real_dir)
+        config = {
+            **DEFAULT_CONFIG,
+            "search_settings": {
+                **DEFAULT_CONFIG["search_settings"],
+                "follow_symlinks": follow_symlinks,
+            },
+        }
+
+        found = find_config_files(temp_home, config, recursive=True)
+
+        names = sorted(f.relative_to(temp_home).as_posix() for f in found)
+        if follow_symlinks:
+            assert names == ["linked.conf", "real/real.conf"]
+        else:
+            assert names == ["real/real.conf"]
+
+
+@pytest.mark.usefixtures("dotz_env")
+class TestBackups:
+    """Test backup creation and listing."""
+
+    def test_create_backup_file(self, temp_home: Path):
+        """Test that a file backup is a copy of the original."""
+        create_test_files(temp_home, {".bashrc": "# bashrc\n"})
+
+        backup_path = create_backup(temp_home / ".bashrc", quiet=True)
+
+        assert backup_path.parent == temp_home / ".dotz" / "backups"
+        assert backup_path.name.startswith(".bashrc_restore_")
+        assert backup_path.read_text() == "# bashrc\n"
+
+    def test_create_backup_missing_file(self, temp_home: Path):
+        """Test that nothing is backed up when the file does not exist."""
+        assert create_backup(temp_home / ".missing", quiet=True) is None
+
+    def test_create_backup_directory(self, temp_home: Path, fast_backup):
+        """Test that a directory is backed up as a tar.gz archive."""
+        create_test_files(temp_home, {".config/app/app.conf": "key=value\n"})
+
+        backup_path = create_backup(temp_home / ".config", quiet=True)
+
+        assert backup_path.name.startswith(".config_restore_")
+        assert backup_path.name.endswith(".tar.gz")
+        assert backup_path.is_file()
+        fast_backup.assert_called_once_with(backup_path, "w:gz")
+
+    def test_list_backups(self, temp_home: Path, fast_backup):
+        """Test that list_backups returns every backup file."""
+        assert list_backups() == []
+        create_test_files(
+            temp_home, {".bashrc": "# bashrc\n", ".config/app.conf": "key=value\n"}
+        )
+
+        backups = {
+            create_backup(temp_home / ".bashrc", quiet=True),
+            create_backup(temp_home / ".config", quiet=True),
+        }
+
+        assert set(list_backups()) == backups
+
+
 class TestRepositoryNotFound:
     """Test behavior when dotz repository is not found."""
 
-    def test_operation_without_repo_raises_error(self):
+    def test_operation_without_repo_raises_error(self, mocker):
         """Test that operations requiring repo raise appropriate error."""
-        with patch("dotz.core.get_dotz_paths") as mock_paths:
-            mock_paths.return_value = {"repo_dir": Path("/nonexistent")}
+        mocker.patch(
+            "dotz.core.get_dotz_paths", return_value={"repo_dir": Path("/nonexistent")}
+        )
 
-            # This would be tested with actual functions that require repo
-            # For now, we'll test the exception class itself
-            with pytest.raises(DotzRepositoryNotFoundError):
-                raise DotzRepositoryNotFoundError("Repository not found")
+        # This would be tested with actual functions that require repo
+        # For now, we'll test the exception class itself
+        with pytest.raises(DotzRepositoryNotFoundError):
+            raise DotzRepositoryNotFoundError("Repository not found")
@@ -15,56 +15,35 @@ from dotz.exceptions import (
 class TestExceptionHierarchy:
     """Test exception class hierarchy and behavior."""
 
-    def test_base_exception(self):
-        """Test base DotzError exception."""
-        error = DotzError("Test error")
-        assert str(error) == "Test error"
-        assert isinstance(error, Exception)
-
-    def test_repository_not_found_error(self):
-        """Test DotzRepositoryNotFoundError."""
-        error = DotzRepositoryNotFoundError("Repository not found")
-        assert str(error) == "Repository not found"
-        assert isinstance(error, DotzError)
-
-    def test_file_not_found_error(self):
-        """Test DotzFileNotFoundError."""
-        error = DotzFileNotFoundError("File not found")
-        assert str(error) == "File not found"
-        assert isinstance(error, DotzError)
-
-    def test_git_error(self):
-        """Test DotzGitError."""
-        error = DotzGitError("Git operation failed")
-        assert str(error) == "Git operation failed"
-        assert isinstance(error, DotzError)
-
-    def test_validation_error(self):
-        """Test DotzValidationError."""
-        error = DotzValidationError("Validation failed")
-        assert str(error) == "Validation failed"
-        assert isinstance(error, DotzError)
-
-    def test_backup_error(self):
-        """Test DotzBackupError."""
-        error = DotzBackupError("Backup operation failed")
-        assert str(error) == "Backup operation failed"
-        assert isinstance(error, DotzError)
+    @pytest.mark.parametrize(
+        "exception_class,base_class,message",
+        [
+            (DotzError, Exception, "Test error"),
+            (DotzRepositoryNotFoundError, DotzError, "Repository not found"),
+            (DotzFileNotFoundError, DotzError, "File not found"),
+            (DotzGitError, DotzError, "Git operation failed"),
+            (DotzValidationError, DotzError, "Validation failed"),
+            (DotzBackupError, DotzError, "Backup operation failed"),
+        ],
+    )
+    def test_exception(self, exception_class, base_class, message):
+        """Test each exception keeps its message and derives from its base."""
+        error = exception_class(message)
+        assert str(error) == message
+        assert isinstance(error, base_class)
 
 
 class TestExceptionUsage:
     """Test exception usage patterns."""
 
-    def test_raising_exceptions(self):
+    @pytest.mark.parametrize(
+        "exception_class",
+        [DotzRepositoryNotFoundError, DotzFileNotFoundError, DotzGitError],
+    )
+    def test_raising_exceptions(self, exception_class):
         """Test that exceptions can be raised and caught properly."""
-        with pytest.raises(DotzRepositoryNotFoundError):
-            raise DotzRepositoryNotFoundError("Test repository error")
-
-        with pytest.raises(DotzFileNotFoundError):
-            raise DotzFileNotFoundError("Test file error")
-
-        with pytest.raises(DotzGitError):
-            raise DotzGitError("Test git error")
+        with pytest.raises(exception_class):
+            raise exception_class("Test error")
 
     def test_exception_with_empty_message(self):
         """Test exceptions with empty messages."""